@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, ConfigDict
 
 
 class Choice(BaseModel):
@@ -11,6 +12,8 @@ class Choice(BaseModel):
         choice (str): The description of the choice.
         choice_type (str): The type of the choice.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     emoji: str
     name: str
     choice: str
@@ -24,6 +27,8 @@ class Choices(BaseModel):
     Attributes:
         choices (list[Choice]): A list of `Choice` objects.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     choices: list[Choice]
 
 
@@ -37,6 +42,8 @@ class Consequence(BaseModel):
         plot (str): A short summary of the plot.
         prose (str): A detailed description of the story so far.
     """
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     choice: str
     consequence: str
     plot: str
@@ -50,4 +57,29 @@ class Answer(BaseModel):
     Attributes:
         answer (str): The answer to the player's question.
     """
-    answer: str
\ No newline at end of file
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    answer: str
+
+
+# Serializers bound once at import, so saving skips model_dump_json's keyword handling on every call.
+CHOICE_TO_JSON = Choice.__pydantic_serializer__.to_json
+_MODEL_TO_JSON = {Choice: CHOICE_TO_JSON}
+
+
+def json_default(obj):
+    """
+    Serializes objects that orjson cannot handle natively.
+
+    Args:
+        obj: The object to serialize.
+
+    Returns:
+        The serializable representation of a Pydantic model, embedded as pre-serialized JSON where possible.
+    """
+    to_json = _MODEL_TO_JSON.get(type(obj))
+    if to_json is not None:
+        return orjson.Fragment(to_json(obj))
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
@@ -0,0 +1,102 @@
+"""
+cache.py
+
+This file contains the `ResponseCache` class which persists LLM responses so repeated prompts skip the OpenAI API.
+
+Classes:
+    - ResponseCache: Stores serialized LLM responses in SQLite, keyed by a hash of the prompt and the LLM settings.
+"""
+
+import hashlib
+import sqlite3
+import threading
+
+
+class ResponseCache:
+    """
+    Stores serialized LLM responses in SQLite, keyed by a hash of the prompt and the LLM settings.
+
+    Attributes:
+        connection (sqlite3.Connection): The connection to the cache database, shared across threads.
+        lock (threading.Lock): Serializes access to the connection.
+        _seeds (dict): Hashers already fed the LLM settings and system message, keyed by both.
+
+    Methods:
+        __init__: Opens the cache database and creates the responses table.
+        lookup: Looks up the cached response for a prompt.
+        update: Stores the response for a prompt.
+    """
+
+    def __init__(self, filename: str = ".gamegirl_cache.sqlite"):
+        """
+        Opens the cache database and creates the responses table.
+
+        Args:
+            filename (str, optional): The SQLite file to store responses in. Defaults to ".gamegirl_cache.sqlite".
+        """
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.lock = threading.Lock()
+        self._seeds = {}
+        self.connection.execute("CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, value TEXT NOT NULL)")
+        self.connection.commit()
+
+    def _key(self, prompt: str, llm_key: str, system: str = None) -> bytes:
+        """
+        Hashes a prompt together with the LLM settings and system message that produced its response.
+
+        The fixed settings and system message are encoded and hashed once, then the hasher is copied per prompt.
+        The system message is tagged and length-prefixed, so it can never run into the prompt and a missing system
+        message is told apart from an empty one.
+
+        Args:
+            prompt (str): The prompt sent to the LLM.
+            llm_key (str): The model and response format used for the prompt.
+            system (str, optional): The system message sent before the prompt. Defaults to None.
+
+        Returns:
+            bytes: The cache key.
+        """
+        seed = self._seeds.get((llm_key, system))
+        if seed is None:
+            seed = hashlib.blake2b(llm_key.encode() + b"\0", digest_size=16)
+            if system is None:
+                seed.update(b"\0")
+            else:
+                system_bytes = system.encode()
+                seed.update(b"\1" + len(system_bytes).to_bytes(8, "little") + system_bytes)
+            self._seeds[(llm_key, system)] = seed
+        hasher = seed.copy()
+        hasher.update(prompt.encode())
+        return hasher.digest()
+
+    def lookup(self, prompt: str, llm_key: str, system: str = None):
+        """
+        Looks up the cached response for a prompt.
+
+        Args:
+            prompt (str): The prompt sent to the LLM.
+            llm_key (str): The model and response format used for the prompt.
+            system (str, optional): The system message sent before the prompt. Defaults to None.
+
+        Returns:
+            str: The JSON-serialized response, or None if the prompt is not cached.
+        """
+        key = self._key(prompt, llm_key, system)
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, prompt: str, llm_key: str, value: str, system: str = None):
+        """
+        Stores the response for a prompt.
+
+        Args:
+            prompt (str): The prompt sent to the LLM.
+            llm_key (str): The model and response format used for the prompt.
+            value (str): The JSON-serialized response.
+            system (str, optional): The system message sent before the prompt. Defaults to None.
+        """
+        key = self._key(prompt, llm_key, system)
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value))
+            self.connection.commit()
@@ -7,35 +7,67 @@ Classes:
     - GenerativeStoryGame: Manages the game flow, interactions with the OpenAI API, and memory management.
 
 Functions:
-    - __init__: Initializes the game, OpenAI client, and memory manager.
+    - __init__: Initializes the game, OpenAI client, memory manager, and response cache.
+    - _cached_parse: Parses a structured completion, serving repeated prompts from the response cache.
+    - _stream_parse: Streams a structured completion, printing one field as it arrives.
+    - _in_background: Runs a function on a background thread and returns a future for its result.
+    - prompt_context: Gets the story state for building prompts, reading it from memory once per memory version.
     - generate_initial_options: Generates initial options for the game based on context and option type.
     - generate_choices: Generates choices for the next stage of the story.
+    - prefetch_choices: Starts generating the next choices in the background.
+    - next_choices: Returns the prefetched choices, or generates them if none are pending.
     - handle_player_question: Handles player questions and generates answers.
     - simulate_consequence: Simulates the consequence of a player's choice.
     - process_consequence: Processes the consequence of a player's choice and updates the memory.
-    - save_story_memory: Saves the current story memory to a file.
-    - load_story_memory: Loads the story memory from a file.
+    - save_story_memory: Saves the memory changes since the last save to the story's log, checkpointing periodically.
+    - _append_history: Appends memory changes to the story's log.
+    - _checkpoint: Writes the full memory to the story file and clears the story's log.
+    - _submit_io: Runs a save on the background I/O thread, reporting any error it raises.
+    - _report_io_error: Reports a failed background save.
+    - _save_snapshot: Replaces the story file with a snapshot on the background I/O thread, then clears the story's log.
+    - _save_bytes: Writes serialized memory to a file on the background I/O thread.
+    - load_story_memory: Loads the story memory from the last checkpoint and replays the story's log.
     - get_user_input: Gets user input from the console.
     - choose_option: Allows the player to choose an option for character, setting, or motivation.
     - get_next_story_number: Gets the next available story number for saving the game.
+    - _handle_help: Shows the help menu.
+    - _handle_full: Shows the full story so far.
+    - _handle_noop: Shows the choices again.
+    - _handle_more: Moves on to a fresh set of choices.
+    - _handle_numeric: Plays one of the generated choices.
+    - _handle_custom: Plays an action typed by the player.
+    - _handle_question: Answers the player's questions about the story until they continue.
     - play: Starts the game and manages the main game loop.
 """
 
 import openai
-from typing import List, Tuple
-import json
+import httpx
+from typing import List
 import argparse
+import atexit
 import os
-import pickle
-from memory import MemoryManager
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import orjson
+from jiter import from_json
+from memory import MemoryManager, HISTORY_CAP
+from cache import ResponseCache
 from base import (
-    Choice, Choices, Consequence, Answer
+    Choice, Choices, Consequence, Answer, json_default
 )
 from prompts import (
-    initial_options_prompt, choices_prompt,
+    CHOICE_RULES, PromptContext, initial_options_prompt, choices_prompt,
     player_question_prompt, consequence_prompt
 )
 
+# Memory keys holding a `Choice`, rebuilt from plain dicts when a story is loaded.
+CHOICE_KEYS = ("character", "setting", "motivation")
+# Number of logged memory changes after which the full memory is checkpointed.
+CHECKPOINT_INTERVAL = 50
+# Sidecar file holding the next story number, so new games skip scanning the directory.
+STORY_COUNTER_FILE = ".gamegirl_next"
+
 
 class GenerativeStoryGame:
     """
@@ -44,77 +76,255 @@ class GenerativeStoryGame:
     Attributes:
         client (openai.OpenAI): The OpenAI client for API interactions.
         memory_manager (MemoryManager): Manages the game memory.
+        cache (ResponseCache): Caches LLM responses by prompt, or None when caching is disabled.
         default_filename (str): The default filename for saving the game.
 
     Methods:
-        __init__: Initializes the game, OpenAI client, and memory manager.
+        __init__: Initializes the game, OpenAI client, memory manager, and response cache.
+        _cached_parse: Parses a structured completion, serving repeated prompts from the response cache.
+        _stream_parse: Streams a structured completion, printing one field as it arrives.
+        _in_background: Runs a function on a background thread and returns a future for its result.
+        prompt_context: Gets the story state for building prompts, reading it from memory once per memory version.
         generate_initial_options: Generates initial options for the game based on context and option type.
         generate_choices: Generates choices for the next stage of the story.
+        prefetch_choices: Starts generating the next choices in the background.
+        next_choices: Returns the prefetched choices, or generates them if none are pending.
         handle_player_question: Handles player questions and generates answers.
         simulate_consequence: Simulates the consequence of a player's choice.
         process_consequence: Processes the consequence of a player's choice and updates the memory.
-        save_story_memory: Saves the current story memory to a file.
-        load_story_memory: Loads the story memory from a file.
+        save_story_memory: Saves the memory changes since the last save to the story's log, checkpointing periodically.
+        _append_history: Appends memory changes to the story's log.
+        _checkpoint: Writes the full memory to the story file and clears the story's log.
+        _submit_io: Runs a save on the background I/O thread, reporting any error it raises.
+        _report_io_error: Reports a failed background save.
+        _save_snapshot: Replaces the story file with a snapshot on the background I/O thread, then clears the story's log.
+        _save_bytes: Writes serialized memory to a file on the background I/O thread.
+        load_story_memory: Loads the story memory from the last checkpoint and replays the story's log.
         get_user_input: Gets user input from the console.
         choose_option: Allows the player to choose an option for character, setting, or motivation.
         get_next_story_number: Gets the next available story number for saving the game.
+        _handle_help: Shows the help menu.
+        _handle_full: Shows the full story so far.
+        _handle_noop: Shows the choices again.
+        _handle_more: Moves on to a fresh set of choices.
+        _handle_numeric: Plays one of the generated choices.
+        _handle_custom: Plays an action typed by the player.
+        _handle_question: Answers the player's questions about the story until they continue.
         play: Starts the game and manages the main game loop.
     """
 
-    def __init__(self):
-        """Initializes the game, OpenAI client, and memory manager."""
-        self.client = openai.OpenAI()  # Initialize the OpenAI client
+    def __init__(self, use_cache: bool = True):
+        """
+        Initializes the game, OpenAI client, memory manager, and response cache.
+
+        Args:
+            use_cache (bool, optional): Whether to serve repeated prompts from the response cache. Defaults to True.
+        """
+        # Keep connections alive across the player's think time so each turn reuses the same TLS session
+        self.client = openai.OpenAI(http_client=httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        ))
         self.memory_manager = MemoryManager()
-        self.memory_manager.write("story_memory", {
-            "actions": [],
-            "plot": "",
-            "user_questions": [],
-            "character": "",
-            "motivation": "",
-            "setting": "",
-            "prose": ""
-        })
+        self.cache = ResponseCache() if use_cache else None
+        self._pending_choices = None
+        self._refresh_choices = False
+        # (memory version, PromptContext) in one attribute, so the prefetch and main threads never pair a context with the wrong version.
+        self._prompt_context = (None, None)
+        self._saved_version = 0
+        self._unchecked_records = 0
+        # A single worker keeps log appends and checkpoints in submission order.
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+        atexit.register(self._io_pool.shutdown, wait=True)
+        # Main-menu inputs mapped to their handlers; anything else is treated as a question.
+        self._handlers = {
+            "h": self._handle_help,
+            "f": self._handle_full,
+            "m": self._handle_more,
+            "": self._handle_noop,
+            "1": self._handle_numeric,
+            "2": self._handle_numeric,
+            "3": self._handle_numeric,
+            "4": self._handle_custom,
+        }
+
+    def _cached_parse(self, prompt: str, response_format, model: str = "gpt-4o-2024-08-06",
+                      stream_field: str = None, refresh: bool = False, system: str = None, **kwargs):
+        """
+        Parses a structured completion, serving repeated prompts from the response cache.
+
+        Args:
+            prompt (str): The prompt to send to the LLM.
+            response_format: The Pydantic model to parse the response into.
+            model (str, optional): The model to use. Defaults to "gpt-4o-2024-08-06".
+            stream_field (str, optional): A field to print while the response streams in. Defaults to None.
+            refresh (bool, optional): Whether to skip the cached response and store a new one. Defaults to False.
+            system (str, optional): A fixed system message to send before the prompt. Defaults to None.
+            **kwargs: Extra arguments for the completion request.
 
-    def generate_initial_options(self, context: str, option: str) -> List[str]:
+        Returns:
+            The parsed response model.
+        """
+        llm_key = f"{model}:{response_format.__name__}:{sorted(kwargs.items())}"
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        if self.cache and not refresh:
+            cached = self.cache.lookup(prompt, llm_key, system)
+            if cached is not None:
+                parsed = response_format.model_validate_json(cached)
+                if stream_field:
+                    print(getattr(parsed, stream_field))
+                return parsed
+        if stream_field:
+            parsed = self._stream_parse(messages, response_format, stream_field, model, **kwargs)
+        else:
+            response = self.client.beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                **kwargs
+            )
+            parsed = response.choices[0].message.parsed
+        if self.cache and parsed is not None:
+            self.cache.update(prompt, llm_key, parsed.model_dump_json(), system)
+        return parsed
+
+    def _stream_parse(self, messages: list, response_format, stream_field: str,
+                      model: str = "gpt-4o-2024-08-06", **kwargs):
+        """
+        Streams a structured completion, printing one field as it arrives.
+
+        Args:
+            messages (list): The chat messages to send to the LLM.
+            response_format: The Pydantic model to parse the response into.
+            stream_field (str): The field to print while the response streams in.
+            model (str, optional): The model to use. Defaults to "gpt-4o-2024-08-06".
+            **kwargs: Extra arguments for the completion request.
+
+        Returns:
+            The parsed response model.
+        """
+        printed = 0
+        field_done = False
+        with self.client.beta.chat.completions.stream(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            **kwargs
+        ) as stream:
+            for event in stream:
+                # Once a later key has started the field is complete, so skip re-parsing the rest of the response.
+                if field_done or event.type != "content.delta":
+                    continue
+                # The SDK's partial parse drops unfinished strings, so re-parse keeping them.
+                partial = from_json(event.snapshot.encode(), partial_mode="trailing-strings")
+                if not isinstance(partial, dict):
+                    continue
+                text = partial.get(stream_field, "")
+                if len(text) > printed:
+                    print(text[printed:], end="", flush=True)
+                    printed = len(text)
+                field_done = stream_field in partial and next(reversed(partial)) != stream_field
+            completion = stream.get_final_completion()
+        print()
+        return completion.choices[0].message.parsed
+
+    @staticmethod
+    def _in_background(function, *args) -> Future:
+        """
+        Runs a function on a background thread and returns a future for its result.
+
+        The thread is a daemon so quitting the game never waits on an in-flight LLM request.
+
+        Args:
+            function: The function to run.
+            *args: The arguments to pass to the function.
+
+        Returns:
+            Future: A future resolving to the function's result.
+        """
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(function(*args))
+            except BaseException as error:
+                future.set_exception(error)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def prompt_context(self) -> PromptContext:
+        """
+        Gets the story state for building prompts, reading it from memory once per memory version.
+
+        Returns:
+            PromptContext: The story state shared by the prompts of the current turn.
+        """
+        version = self.memory_manager.get_latest_version()
+        cached_version, context = self._prompt_context
+        if cached_version != version:
+            context = PromptContext.from_memory(self.memory_manager)
+            self._prompt_context = (version, context)
+        return context
+
+    def generate_initial_options(self, context: str, option: str, refresh: bool = False) -> List[Choice]:
         """
         Generates initial options for the game based on context and option type.
 
         Args:
             context (str): The context for generating options.
             option (str): The type of option to generate (e.g., character, setting).
+            refresh (bool, optional): Whether to generate new options even if some are cached for this context. Defaults to False.
 
         Returns:
-            List[str]: A list of generated options.
+            List[Choice]: A list of generated options.
         """
         prompt = initial_options_prompt(context, option)
-        response = self.client.beta.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
-            response_format=Choices,
-        )
-        choices = json.loads(response.choices[0].message.parsed.model_dump_json()).get("choices", [])
+        choices = self._cached_parse(prompt, Choices, refresh=refresh, max_tokens=500).choices
         return choices
 
-    def generate_choices(self) -> List[str]:
+    def generate_choices(self, refresh: bool = False) -> List[Choice]:
         """
         Generates choices for the next stage of the story.
 
+        Args:
+            refresh (bool, optional): Whether to generate new choices even if some are cached for this story state. Defaults to False.
+
         Returns:
-            List[str]: A list of generated choices.
+            List[Choice]: A list of generated choices.
         """
-        prompt = choices_prompt(self.memory_manager)
-        response = self.client.beta.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
-            messages=[{"role": "user", "content": prompt}],
-            response_format=Choices
-        )
-        options = json.loads(response.choices[0].message.content)
+        prompt = choices_prompt(self.prompt_context())
+        options = self._cached_parse(prompt, Choices, refresh=refresh, system=CHOICE_RULES).choices
         return options
 
+    def prefetch_choices(self, refresh: bool = False):
+        """
+        Starts generating the next choices in the background so the request overlaps with the player's typing time.
+
+        Args:
+            refresh (bool, optional): Whether to generate new choices even if some are cached for this story state. Defaults to False.
+        """
+        self._pending_choices = self._in_background(self.generate_choices, refresh)
+
+    def next_choices(self) -> List[Choice]:
+        """
+        Returns the prefetched choices, or generates them if none are pending or fresh ones were requested.
+
+        Returns:
+            List[Choice]: A list of generated choices.
+        """
+        pending, self._pending_choices = self._pending_choices, None
+        refresh, self._refresh_choices = self._refresh_choices, False
+        if pending is None or refresh:
+            return self.generate_choices(refresh)
+        return pending.result()
+
     def handle_player_question(self, question: str) -> str:
         """
-        Handles player questions and generates answers.
+        Handles player questions and generates answers, printing the answer as it streams in.
 
         Args:
             question (str): The player's question.
@@ -122,32 +332,22 @@ class GenerativeStoryGame:
         Returns:
             str: The generated answer.
         """
-        prompt = player_question_prompt(self.memory_manager, question)
-        response = self.client.beta.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
-            messages=[{"role": "user", "content": prompt}],
-            response_format=Answer
-        )
-        answer = json.loads(response.choices[0].message.content)
-        return answer.get("answer", "")
+        prompt = player_question_prompt(self.prompt_context(), question)
+        answer = self._cached_parse(prompt, Answer, stream_field="answer")
+        return answer.answer
 
-    def simulate_consequence(self, choice: str) -> Tuple[str, str]:
+    def simulate_consequence(self, choice: str) -> Consequence:
         """
-        Simulates the consequence of a player's choice.
+        Simulates the consequence of a player's choice, printing it as it streams in.
 
         Args:
             choice (str): The player's choice.
 
         Returns:
-            Tuple[str, str]: The simulated consequence.
+            Consequence: The simulated consequence.
         """
-        prompt = consequence_prompt(self.memory_manager, choice)
-        response = self.client.beta.chat.completions.parse(
-            model="gpt-4o-2024-08-06",
-            messages=[{"role": "user", "content": prompt}],
-            response_format=Consequence
-        )
-        consequence = json.loads(response.choices[0].message.content)
+        prompt = consequence_prompt(self.prompt_context(), choice)
+        consequence = self._cached_parse(prompt, Consequence, stream_field="consequence")
         return consequence
 
     def process_consequence(self, turn: int, chosen_action: str):
@@ -162,40 +362,171 @@ class GenerativeStoryGame:
         actions = self.memory_manager.read("actions")
         actions.append({
             "turn_sequence": turn,
-            "choice": consequence.get("choice", ""),
-            "consequence": consequence.get("consequence", "")
+            "choice": consequence.choice,
+            "consequence": consequence.consequence
         })
         self.memory_manager.update("actions", actions)
-        self.memory_manager.update("prose", consequence.get("prose", ""))
-        self.memory_manager.update("plot", consequence.get("plot", ""))
+        self.memory_manager.update("prose", consequence.prose)
+        self.memory_manager.update("plot", consequence.plot)
         self.save_story_memory(self.default_filename)
 
     def save_story_memory(self, filename: str):
         """
-        Saves the current story memory to a file.
+        Saves the memory changes since the last save to the story's log, checkpointing the full memory periodically.
+
+        Args:
+            filename (str): The filename to save the memory to.
+        """
+        records = []
+        for record in reversed(self.memory_manager.history):
+            if record[0] <= self._saved_version:
+                break
+            records.append(record)
+        if not records:
+            return
+        records.reverse()
+        self._append_history(filename, records)
+        self._saved_version = self.memory_manager.version
+        self._unchecked_records += len(records)
+        if self._unchecked_records >= CHECKPOINT_INTERVAL:
+            self._checkpoint(filename)
+
+    def _append_history(self, filename: str, records: list):
+        """
+        Appends memory changes to the story's log, one JSON line per change.
+
+        Args:
+            filename (str): The story filename the log belongs to.
+            records (list): The history records to append.
+        """
+        lines = b"".join(
+            orjson.dumps(record, default=json_default, option=orjson.OPT_APPEND_NEWLINE) for record in records
+        )
+        self._submit_io(self._save_bytes, filename + ".log", lines, 'ab')
+
+    def _checkpoint(self, filename: str):
+        """
+        Writes the full memory to the story file and clears the story's log.
 
         Args:
             filename (str): The filename to save the memory to.
         """
-        with open(filename, 'wb') as file:
-            pickle.dump({
-                'memory': self.memory_manager.memory,
-                'history': self.memory_manager.history,
-                'version': self.memory_manager.version
-            }, file, protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot = orjson.dumps({
+            'memory': self.memory_manager.memory,
+            'history': list(self.memory_manager.history),
+            'version': self.memory_manager.version
+        }, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+        self._submit_io(self._save_snapshot, filename, snapshot)
+        self._unchecked_records = 0
+
+    def _submit_io(self, function, *args):
+        """
+        Runs a save on the background I/O thread, reporting any error it raises to the player.
+
+        Args:
+            function: The save function to run.
+            *args: The arguments to pass to the function.
+        """
+        self._io_pool.submit(function, *args).add_done_callback(self._report_io_error)
+
+    @staticmethod
+    def _report_io_error(future: Future):
+        """
+        Reports a failed background save, which would otherwise be dropped with its future.
+
+        Args:
+            future (Future): The finished save.
+        """
+        error = future.exception()
+        if error is not None:
+            print(f"\nWarning: the story could not be saved: {error}", flush=True)
+
+    @staticmethod
+    def _save_snapshot(filename: str, snapshot: bytes):
+        """
+        Replaces the story file with a snapshot on the background I/O thread, then clears the story's log.
+
+        The snapshot is written to a temporary file and moved into place, so an interrupted write never
+        leaves a half-written story file, and the log is only cleared once the snapshot is in place.
+
+        Args:
+            filename (str): The story file to replace.
+            snapshot (bytes): The serialized memory.
+        """
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, 'wb') as file:
+            file.write(snapshot)
+        os.replace(temp_filename, filename)
+        with open(filename + ".log", 'wb'):
+            pass
+
+    @staticmethod
+    def _save_bytes(filename: str, payload: bytes, mode: str):
+        """
+        Writes serialized memory to a file on the background I/O thread.
+
+        Args:
+            filename (str): The file to write to.
+            payload (bytes): The serialized memory.
+            mode (str): The file mode, 'ab' to append or 'wb' to overwrite.
+        """
+        with open(filename, mode) as file:
+            file.write(payload)
 
     def load_story_memory(self, filename: str):
         """
-        Loads the story memory from a file.
+        Loads the story memory from the last checkpoint and replays the changes logged after it.
 
         Args:
             filename (str): The filename to load the memory from.
+
+        Raises:
+            FileNotFoundError: If there is no story at `filename`.
+            ValueError: If the story was saved in the pickle format of older versions, or its log is corrupt.
         """
-        with open(filename, 'rb') as file:
-            data = pickle.load(file)
-            self.memory_manager.memory = data['memory']
-            self.memory_manager.history = data['history']
+        log_filename = filename + ".log"
+        if not os.path.exists(filename) and not os.path.exists(log_filename):
+            raise FileNotFoundError(f"No story found at {filename}")
+        if os.path.exists(filename):
+            with open(filename, 'rb') as file:
+                payload = file.read()
+            # Older versions pickled the story; pickle streams start with the PROTO opcode, which JSON never does.
+            if payload.startswith(b"\x80"):
+                raise ValueError(f"{filename} was saved by an older version of GameGirl and can no longer be loaded")
+            data = orjson.loads(payload)
+            memory = data['memory']
+            for key in CHOICE_KEYS:
+                if isinstance(memory.get(key), dict):
+                    memory[key] = Choice.model_validate(memory[key])
+            self.memory_manager.memory = memory
+            self.memory_manager.history = deque((tuple(entry) for entry in data['history']), maxlen=HISTORY_CAP)
             self.memory_manager.version = data['version']
+        if os.path.exists(log_filename):
+            with open(log_filename, 'rb') as file:
+                lines = file.readlines()
+            saved_bytes = 0
+            for number, line in enumerate(lines, 1):
+                # Every record is appended with its newline in one write, so a last line without one was cut
+                # off when the game stopped mid-save. Treat it as never saved and drop it so later appends
+                # start on a fresh line.
+                if not line.endswith(b"\n"):
+                    os.truncate(log_filename, saved_bytes)
+                    break
+                try:
+                    version, key, value, timestamp = orjson.loads(line)
+                except orjson.JSONDecodeError as error:
+                    raise ValueError(f"{log_filename} is corrupt at line {number}") from error
+                saved_bytes += len(line)
+                # Records already covered by the checkpoint are left over from an interrupted save.
+                if version <= self.memory_manager.version:
+                    continue
+                if key in CHOICE_KEYS and isinstance(value, dict):
+                    value = Choice.model_validate(value)
+                self.memory_manager.memory[key] = value
+                self.memory_manager.history.append((version, key, value, timestamp))
+                self.memory_manager.version = version
+                self._unchecked_records += 1
+        self._saved_version = self.memory_manager.version
 
     def get_user_input(self, prompt: str) -> str:
         """
@@ -213,7 +544,7 @@ class GenerativeStoryGame:
             exit()
         return user_input
 
-    def choose_option(self, context: str, option_type: str) -> str:
+    def choose_option(self, context: str, option_type: str) -> Choice:
         """
         Allows the player to choose an option for character, setting, or motivation.
 
@@ -222,38 +553,141 @@ class GenerativeStoryGame:
             option_type (str): The type of option to choose (e.g., character, setting).
 
         Returns:
-            str: The chosen option.
+            Choice: The chosen option.
         """
         options = self.generate_initial_options(context, option_type)
-        print(f"\nChoose your {option_type}:")
-        for i, option in enumerate(options, 1):
-            if i > 3:
+        while True:
+            print(f"\nChoose your {option_type}:")
+            for i, option in enumerate(options, 1):
+                if i > 3:
+                    break
+                print(f"{i}. {option.emoji} - {option.name} - {option.choice}")
+            print(f"4. Type your own {option_type}")
+            choice = self.get_user_input(f"Pick your {option_type} (1-3), m for more options, or type your own {option_type}: ")
+            if choice != "m":
                 break
-            print(f"{i}. {option.get('emoji')} - {option.get('name')} - {option.get('choice')}")
-        print(f"4. Type your own {option_type}")
-        choice = self.get_user_input(f"Pick your {option_type} (1-3) or type your own {option_type}: ")
+            # Cached options never change for the same context, so ask the LLM for fresh ones.
+            options = self.generate_initial_options(context, option_type, refresh=True)
         if choice in ["1", "2", "3"]:
-            chosen_option = Choice(emoji=options[int(choice) - 1].get("emoji", ""),
-                                    name=options[int(choice) - 1].get("name", ""),
-                                    choice=options[int(choice) - 1].get("choice", ""),
-                                    choice_type=options[int(choice) - 1].get("choice_type", ""))
+            chosen_option = options[int(choice) - 1]
         else:
-            chosen_option = Choice(emoji="", name="", choice=choice)
+            chosen_option = Choice(emoji="", name="", choice=choice, choice_type=option_type)
         self.memory_manager.write(option_type, chosen_option)
         return chosen_option
 
     def get_next_story_number(self):
         """
-        Gets the next available story number for saving the game.
+        Gets the next available story number for saving the game and reserves it in the story counter file.
 
         Returns:
             int: The next available story number.
         """
-        existing_files = [f for f in os.listdir() if f.startswith("story_") and f.endswith(".gsg")]
-        if not existing_files:
-            return 1
-        numbers = [int(f.split("_")[1].split(".")[0]) for f in existing_files]
-        return max(numbers) + 1
+        try:
+            with open(STORY_COUNTER_FILE) as file:
+                number = int(file.read())
+        except (FileNotFoundError, ValueError):
+            number = None
+        # Stories saved without the counter (e.g. by older versions or copied in) must never be overwritten.
+        if number is None or os.path.exists(f"story_{number}.gsg") or os.path.exists(f"story_{number}.gsg.log"):
+            existing_files = [f for f in os.listdir() if f.startswith("story_") and f.endswith((".gsg", ".gsg.log"))]
+            numbers = [int(f.split("_")[1].split(".")[0]) for f in existing_files]
+            number = max(numbers, default=0) + 1
+        temp_filename = STORY_COUNTER_FILE + ".tmp"
+        with open(temp_filename, 'w') as file:
+            file.write(str(number + 1))
+        os.replace(temp_filename, STORY_COUNTER_FILE)
+        return number
+
+    def _handle_help(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Shows the help menu.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's input.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        self.prefetch_choices()
+        input("\nType for questions\nf for full story\nm for more choices\nq to quit\n")
+
+    def _handle_full(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Shows the full story so far.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's input.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        prose = self.memory_manager.read('prose')
+        print(f"\nStory so far: \n{prose}")
+
+    def _handle_noop(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Shows the choices again.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's input.
+            choices (List[Choice]): The choices shown this turn.
+        """
+
+    def _handle_more(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Moves on to a fresh set of choices.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's input.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        self._refresh_choices = True
+
+    def _handle_numeric(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Plays one of the generated choices.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The number of the chosen choice.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        chosen_action = choices[int(player_choice) - 1].choice
+        self.process_consequence(turn, chosen_action)
+
+    def _handle_custom(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Plays an action typed by the player.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's input.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        chosen_action = self.get_user_input("Enter your custom action: ")
+        self.process_consequence(turn, chosen_action)
+
+    def _handle_question(self, turn: int, player_choice: str, choices: List[Choice]):
+        """
+        Answers the player's questions about the story until they continue.
+
+        Args:
+            turn (int): The current turn number.
+            player_choice (str): The player's first question.
+            choices (List[Choice]): The choices shown this turn.
+        """
+        question = player_choice
+        self.prefetch_choices()
+        while True:
+            print(f"\nQuestion: {question}\nAnswer: ", end="", flush=True)
+            answer = self.handle_player_question(question)
+            user_questions = self.memory_manager.read("user_questions") or []
+            user_questions.append({"question": question, "answer": answer})
+            self.memory_manager.update("user_questions", user_questions)
+            self.save_story_memory(self.default_filename)
+            question = self.get_user_input("Type your question for analysis\nEnter c to continue:\n")
+            if question == "c":
+                break
 
     def play(self, filename: str = None):
         """
@@ -268,56 +702,33 @@ class GenerativeStoryGame:
         else:
             print("Welcome to GameGirl - The stories we tell ourselves!\nPress q to quit.")
             self.memory_manager.write("character", self.choose_option("", "character"))
-            self.memory_manager.write("setting", self.choose_option(str(self.memory_manager.memory), "setting"))
-            self.memory_manager.write("motivation", self.choose_option(str(self.memory_manager.memory), "motivation"))
+            self.memory_manager.write("setting", self.choose_option(self.memory_manager.as_json_str(), "setting"))
+            self.memory_manager.write("motivation", self.choose_option(self.memory_manager.as_json_str(), "motivation"))
             self.memory_manager.write("actions", [])
             self.memory_manager.write("turn", 0)
         turn = self.memory_manager.read("turn")
 
         while True:
             turn += 1
-            if self.memory_manager.read('plot'):
-                print(f"\nStory summary so far: \n{self.memory_manager.read('plot')}")
+            plot = self.memory_manager.read('plot')
+            if plot:
+                print(f"\nStory summary so far: \n{plot}")
             else:
                 print("\nWhat's your next move?\n")
-            choices = self.generate_choices().get("choices", [])
+            choices = self.next_choices()
             for i, choice in enumerate(choices, 1):
-                print(f"{i}. {choice.get('emoji')} - {choice.get('name')} - {choice.get("choice", "")} ({choice.get("choice_type", "")})")
+                print(f"{i}. {choice.emoji} - {choice.name} - {choice.choice} ({choice.choice_type})")
             print(f"4. Custom event")
             player_choice = self.get_user_input(f"Enter your choice (1-4) or h for help:")
-            match player_choice:
-                case "h":
-                    player_choice = input("\nType for questions\nf for full story\nm for more choices\nq to quit\n")
-                    continue
-                case "f":
-                    print(f"\nStory so far: \n{self.memory_manager.read('prose')}")
-                    continue
-                case "m" | "":
-                    continue
-                case "1" | "2" | "3":
-                    chosen_action = choices[int(player_choice) - 1].get("choice", "")
-                    self.process_consequence(turn, chosen_action)
-                case "4":
-                    chosen_action = self.get_user_input("Enter your custom action: ")
-                    self.process_consequence(turn, chosen_action)
-                case _:
-                    question = player_choice
-                    while True:
-                        answer = self.handle_player_question(question)
-                        print(f"\nQuestion: {question}\nAnswer: {answer}")
-                        user_questions = self.memory_manager.read("user_questions")
-                        user_questions.append({"question": question, "answer": answer})
-                        self.memory_manager.update("user_questions", user_questions)
-                        self.save_story_memory(self.default_filename)
-                        question = self.get_user_input("Type your question for analysis\nEnter c to continue:\n")
-                        if question == "c":
-                            break
+            handler = self._handlers.get(player_choice, self._handle_question)
+            handler(turn, player_choice, choices)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generative Story Game")
     parser.add_argument('--file', type=str, help='File to load the story memory from')
+    parser.add_argument('--no-cache', action='store_true', help='Always query the LLM instead of reusing cached responses')
     args = parser.parse_args()
 
-    game = GenerativeStoryGame()
+    game = GenerativeStoryGame(use_cache=not args.no_cache)
     game.play(args.file)
\ No newline at end of file
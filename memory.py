@@ -1,4 +1,11 @@
+import time
+from collections import deque
 from datetime import datetime
+import orjson
+from base import json_default
+
+# Maximum number of memory changes kept in the history; older changes are dropped.
+HISTORY_CAP = 1024
 
 
 class MemoryManager:
@@ -7,23 +14,27 @@ class MemoryManager:
 
     Attributes:
         memory (dict): The current memory state.
-        history (list): A history of memory changes.
+        history (deque): The most recent memory changes, up to `HISTORY_CAP` entries.
         version (int): The current version number of the memory.
 
     Methods:
         __init__: Initializes the memory manager.
         read: Reads a value from memory.
+        read_many: Reads several values from memory in one call.
         write: Writes a value to memory and updates the history.
         update: Updates a value in memory and updates the history.
         get_latest_version: Gets the latest version number of the memory.
         get_history: Gets the history of memory changes.
+        as_json_str: Gets the memory serialized as JSON, reusing the last serialization while memory is unchanged.
     """
 
     def __init__(self):
         """Initializes the memory manager."""
         self.memory = {}
-        self.history = []
+        self.history = deque(maxlen=HISTORY_CAP)
         self.version = 0
+        self._dirty = True
+        self._json_cache = None
 
     def read(self, key: str):
         """
@@ -37,6 +48,19 @@ class MemoryManager:
         """
         return self.memory.get(key, None)
 
+    def read_many(self, keys) -> dict:
+        """
+        Reads several values from memory in one call.
+
+        Args:
+            keys: The keys to read from memory.
+
+        Returns:
+            dict: The value for each key, or None for keys that do not exist.
+        """
+        get = self.memory.get
+        return {key: get(key) for key in keys}
+
     def write(self, key: str, value):
         """
         Writes a value to memory and updates the history.
@@ -46,9 +70,10 @@ class MemoryManager:
             value: The value to write to memory.
         """
         self.version += 1
-        timestamp = datetime.now().isoformat()
+        timestamp = time.time_ns()
         self.memory[key] = value
         self.history.append((self.version, key, value, timestamp))
+        self._dirty = True
 
     def update(self, key: str, value):
         """
@@ -60,9 +85,10 @@ class MemoryManager:
         """
         if key in self.memory:
             self.version += 1
-            timestamp = datetime.now().isoformat()
+            timestamp = time.time_ns()
             self.memory[key] = value
             self.history.append((self.version, key, value, timestamp))
+            self._dirty = True
         else:
             self.write(key, value)
 
@@ -77,9 +103,24 @@ class MemoryManager:
 
     def get_history(self):
         """
-        Gets the history of memory changes.
+        Gets the history of memory changes, with timestamps formatted as ISO strings.
+
+        Returns:
+            list: The most recent memory changes.
+        """
+        return [
+            (version, key, value, datetime.fromtimestamp(timestamp / 1e9).isoformat())
+            for version, key, value, timestamp in self.history
+        ]
+
+    def as_json_str(self) -> str:
+        """
+        Gets the memory serialized as JSON, reusing the last serialization while memory is unchanged.
 
         Returns:
-            list: The history of memory changes.
+            str: The memory as a JSON string.
         """
-        return self.history
\ No newline at end of file
+        if self._dirty:
+            self._json_cache = orjson.dumps(self.memory, default=json_default).decode()
+            self._dirty = False
+        return self._json_cache
\ No newline at end of file
@@ -5,57 +5,37 @@ prompts.py
 
 This file contains functions that generate prompts for the OpenAI API based on the current state of the game.
 
+Classes:
+    - PromptContext: The story state a turn's prompts are built from.
+
 Functions:
     - initial_options_prompt: Generates a prompt for initial options based on context and option type.
     - choices_prompt: Generates a prompt for choices based on the current state of the game.
     - player_question_prompt: Generates a prompt for answering a player's question based on the current state of the game.
     - consequence_prompt: Generates a prompt for simulating the consequence of a player's choice based on the current state of the game.
-"""
 
-def initial_options_prompt(context: str, option: str) -> str:
-    """
-    Generates a prompt for initial options based on context and option type.
-
-    Args:
-        context (str): The context for generating options.
-        option (str): The type of option to generate (e.g., character, setting).
-
-    Returns:
-        str: The generated prompt.
-    """
-    return f"""
-    Given the context:
-    {context}
-    Using an emoji as inspiration, generate 3 compelling and addictive options for {option} to create a fun, relatable, coherent and thought-provoking storytelling game.
-    Infuse deep and inspiring elements drawn from philosophical ideas, but avoid mentioning authors or using exact concepts from their works.
-    Embrace a modern, dynamic style that resonates with today's audience, adding life to the choices with vivid details like character names, traits, ideologies,  expressive adjectives etc
-    Each option should be concise, with a maximum length of 20 words.
-    - **Be relatable, realistic, and grounded in the real world.**
-    - **Use simple language and always aim to be under 50 on Flesch-Kincaid Readability Tests score.**
-    """
+Constants:
+    - CHOICE_RULES: The fixed instructions for generating choices, sent as the system message alongside `choices_prompt`.
 
+Story prompts take a `PromptContext` read from memory once per turn and are cached on it, so asking for the same
+prompt again before memory changes (e.g. when the player asks for more choices) reuses the previous string.
 
-def choices_prompt(memory_manager) -> str:
-    """
-    Generates a prompt for choices based on the current state of the game.
+These functions only join strings, so do not decorate them with `numba.jit`/`njit`: Numba's string support is
+limited and compiles string formatting into code slower than plain CPython.
+"""
 
-    Args:
-        memory_manager (MemoryManager): The memory manager containing the current state of the game.
+import functools
+import string
+from dataclasses import dataclass
 
-    Returns:
-        str: The generated prompt.
-    """
-    return f"""
-    **Given the following story summary: {memory_manager.read("plot")}
+__all__ = ["CHOICE_RULES", "PromptContext", "initial_options_prompt", "choices_prompt", "player_question_prompt", "consequence_prompt"]
 
-    Character: {memory_manager.read("character")}
-    Setting: {memory_manager.read("setting")}
-    Motivation: {memory_manager.read("motivation")}
-    Prose: {memory_manager.read("prose")}
+# Memory keys every story prompt is built from, in the order they appear in the templates.
+_STORY_KEYS = ("character", "setting", "motivation", "plot", "prose")
 
-    **Generate 3 interesting and unique choices for the next stage of the story game. Each choice should:**
 
-    - **Next event is randomly selected from one of these types, but prefer the ones that are most relevant and interesting to the story:**
+# Long constant blocks of the choice rules, kept apart so `CHOICE_RULES` below reads as an outline.
+_EVENT_TYPES = """\
      1. Character development
      2. Character's emotion or mental model
      3. Reveal key information
@@ -68,6 +48,34 @@ def choices_prompt(memory_manager) -> str:
      10. Resolution of a conflict
      11. Character decision or turning point
      12. Character's perspective
+"""
+_INSPIRATION_RULE = """\
+    - **Write in concrete and draw subtle inspiration from philosophical ideas of authors like Franz Kafka, Isaac Asimov, Ursula K. Le Guin, Michael Crichton, Albert Camus, Gilles Deleuze, Fyodor Dostoevsky, Jonathan Haidt, and Jorge Luis Borges—without mentioning their names or exact concepts.**
+"""
+
+
+# Templates start with their fixed instructions and end with the game state, so consecutive requests share
+# a byte-identical prefix that the provider's prompt cache can reuse. State that changes least often comes first.
+_INITIAL_OPTIONS_TMPL = """
+    Using an emoji as inspiration, generate 3 compelling and addictive options of the type given below to create a fun, relatable, coherent and thought-provoking storytelling game.
+    Infuse deep and inspiring elements drawn from philosophical ideas, but avoid mentioning authors or using exact concepts from their works.
+    Embrace a modern, dynamic style that resonates with today's audience, adding life to the choices with vivid details like character names, traits, ideologies,  expressive adjectives etc
+    Each option should be concise, with a maximum length of 20 words.
+    - **Be relatable, realistic, and grounded in the real world.**
+    - **Use simple language and always aim to be under 50 on Flesch-Kincaid Readability Tests score.**
+    Option type: {option}
+    Given the context:
+    {context}
+    """
+
+
+# Sent as the system message of every choices request, kept separate from the story state sent as the user
+# message. It is too short to be prompt-cached on its own; it only forms the fixed start of each request.
+CHOICE_RULES = """
+    **Generate 3 interesting and unique choices for the next stage of the story game described by the user. Each choice should:**
+
+    - **Next event is randomly selected from one of these types, but prefer the ones that are most relevant and interesting to the story:**
+""" + _EVENT_TYPES + """\
 
     - **Consider the reader as a college student and write accordingly.**
     - **Be relatable, realistic, and contextually consistent with the given story details.**
@@ -77,7 +85,7 @@ def choices_prompt(memory_manager) -> str:
     - **Be creative and consistent with the current story and past actions, realistically incorporating emojis as cues.**
     - **Be less than 15 words and start with a relevant emoji.**
     - **Suggest possibilities that could lead to a satisfying conclusion of the story.**
-    - **Write in concrete and draw subtle inspiration from philosophical ideas of authors like Franz Kafka, Isaac Asimov, Ursula K. Le Guin, Michael Crichton, Albert Camus, Gilles Deleuze, Fyodor Dostoevsky, Jonathan Haidt, and Jorge Luis Borges—without mentioning their names or exact concepts.**
+""" + _INSPIRATION_RULE + """\
     - **Focus on engaging the user with creative and consistent choices that encourage continued interaction.**
     - **Be very clear if the choice is an environment change or an action by the character and frame the choice accordingly.**
     - **Use the character, setting, plot, and motivation to create choices that are coherent with the story.**
@@ -92,52 +100,208 @@ def choices_prompt(memory_manager) -> str:
     """
 
 
-def player_question_prompt(memory_manager, question: str) -> str:
+_CHOICES_TMPL = """
+    Character: {character}
+    Setting: {setting}
+    Motivation: {motivation}
+    Story summary: {plot}
+    Prose: {prose}
     """
-    Generates a prompt for answering a player's question based on the current state of the game.
+
+
+_PLAYER_QUESTION_TMPL = """
+    Answer the question at the end based on the following story under 150 words.
+    Character: {character}
+    Setting: {setting}
+    Motivation: {motivation}
+    Plot: {plot}
+    Story so far: {prose}
+
+    Question: {question}
+    """
+
+
+_CONSEQUENCE_TMPL = """
+    Generate a consequence for the action at the end in the story game.
+    Be creative and consider the past actions when generating the consequence, keep it causal and realistic.
+    Provide the consequence with 4 elements:
+    1. choice - A string description of the choice user made
+    2. consequence - A string describing what happens next less than 100 words
+    3. prose - A detailed description of the story so far including this new consequence structured as a short story. Be consistent with past actions and consequences and add more detail to the plot to make the story coherent. Keep all key information.
+    4. plot - A short summary describing the plot of the story based on the prose.
+    Character: {character}
+    Setting: {setting}
+    Motivation: {motivation}
+    Plot: {plot}
+    Story so far: {prose}
+    Action: {choice}
+    """
+
+
+def _split_template(template: str, fields: tuple) -> tuple:
+    """
+    Splits a template into the constant text around its placeholders.
 
     Args:
-        memory_manager (MemoryManager): The memory manager containing the current state of the game.
-        question (str): The player's question.
+        template (str): The template to split.
+        fields (tuple): The placeholder names in the order the caller joins their values in.
+
+    Returns:
+        tuple: The constant fragments, one more than the number of placeholders.
+
+    Raises:
+        ValueError: If the template's placeholders do not match `fields`.
+    """
+    parsed = list(string.Formatter().parse(template))
+    names = tuple(name for _, name, _, _ in parsed if name is not None)
+    if names != fields:
+        raise ValueError(f"Template placeholders {names} do not match {fields}")
+    return tuple(literal for literal, _, _, _ in parsed)
+
+
+# Templates are rendered by joining these fragments with the values, which skips re-parsing the template
+# on every call the way str.format does. Each builder below joins its values in the order given here.
+_INITIAL_OPTIONS_PARTS = _split_template(_INITIAL_OPTIONS_TMPL, ("option", "context"))
+_CHOICES_PARTS = _split_template(_CHOICES_TMPL, _STORY_KEYS)
+_PLAYER_QUESTION_PARTS = _split_template(_PLAYER_QUESTION_TMPL, _STORY_KEYS + ("question",))
+_CONSEQUENCE_PARTS = _split_template(_CONSEQUENCE_TMPL, _STORY_KEYS + ("choice",))
+
+
+def _trim_prose(prose: str, max_chars: int = 2000, head_chars: int = 200) -> str:
+    """
+    Shortens long prose to its opening and its most recent part.
+
+    Args:
+        prose (str): The story so far.
+        max_chars (int, optional): The maximum length to keep. Defaults to 2000.
+        head_chars (int, optional): How much of the opening to keep. Defaults to 200.
+
+    Returns:
+        str: The prose, trimmed in the middle if it is longer than `max_chars`.
+    """
+    if len(prose) <= max_chars:
+        return prose
+    return prose[:head_chars] + " ... " + prose[-(max_chars - head_chars):]
+
+
+@dataclass(frozen=True, slots=True)
+class PromptContext:
+    """
+    Represents the story state a turn's prompts are built from, read from memory once and shared by them.
+
+    Attributes:
+        character: The chosen character.
+        setting: The chosen setting.
+        motivation: The chosen motivation.
+        plot: A short summary of the plot.
+        prose: The story so far.
+    """
+    character: object
+    setting: object
+    motivation: object
+    plot: object
+    prose: object
+
+    @classmethod
+    def from_memory(cls, memory_manager) -> "PromptContext":
+        """
+        Builds a prompt context from the current state of the game.
+
+        Args:
+            memory_manager (MemoryManager): The memory manager containing the current state of the game.
+
+        Returns:
+            PromptContext: The prompt context.
+        """
+        return cls(**memory_manager.read_many(_STORY_KEYS))
+
+    def as_strings(self) -> tuple:
+        """
+        Formats the story state for interpolation into a prompt.
+
+        Returns:
+            tuple: The character, setting, motivation, plot and prose as strings.
+        """
+        return str(self.character), str(self.setting), str(self.motivation), str(self.plot), str(self.prose)
+
+
+@functools.cache
+def _initial_options_parts_for(option: str) -> tuple:
+    """
+    Fills the option type into the initial options template, once per option type.
+
+    Args:
+        option (str): The type of option to generate (e.g., character, setting).
+
+    Returns:
+        tuple: The constant text before and after the context.
+    """
+    p0, p1, p2 = _INITIAL_OPTIONS_PARTS
+    return p0 + option + p1, p2
+
+
+@functools.lru_cache(maxsize=8)
+def initial_options_prompt(context: str, option: str) -> str:
+    """
+    Generates a prompt for initial options based on context and option type.
+
+    Args:
+        context (str): The context for generating options.
+        option (str): The type of option to generate (e.g., character, setting).
 
     Returns:
         str: The generated prompt.
     """
-    return f"""
-    Story so far: {memory_manager.read("prose")}
-    Motivation: {memory_manager.read("motivation")}
-    Plot: {memory_manager.read("plot")}
-    Character: {memory_manager.read("character")}
-    Setting: {memory_manager.read("setting")}
+    head, tail = _initial_options_parts_for(option)
+    return "".join((head, context, tail))
 
-    Answer the following question based on the above story under 150 words:
-    Question: {question}
+
+@functools.lru_cache(maxsize=8)
+def choices_prompt(context: PromptContext) -> str:
     """
+    Generates a prompt for choices based on the current state of the game, to be sent after `CHOICE_RULES`.
+
+    Args:
+        context (PromptContext): The current state of the game.
+
+    Returns:
+        str: The generated prompt.
+    """
+    character, setting, motivation, plot, prose = context.as_strings()
+    p0, p1, p2, p3, p4, p5 = _CHOICES_PARTS
+    return "".join((p0, character, p1, setting, p2, motivation, p3, plot, p4, _trim_prose(prose), p5))
 
 
-def consequence_prompt(memory_manager, choice: str) -> str:
+@functools.lru_cache(maxsize=8)
+def player_question_prompt(context: PromptContext, question: str) -> str:
+    """
+    Generates a prompt for answering a player's question based on the current state of the game.
+
+    Args:
+        context (PromptContext): The current state of the game.
+        question (str): The player's question.
+
+    Returns:
+        str: The generated prompt.
+    """
+    character, setting, motivation, plot, prose = context.as_strings()
+    p0, p1, p2, p3, p4, p5, p6 = _PLAYER_QUESTION_PARTS
+    return "".join((p0, character, p1, setting, p2, motivation, p3, plot, p4, _trim_prose(prose), p5, question, p6))
+
+
+@functools.lru_cache(maxsize=8)
+def consequence_prompt(context: PromptContext, choice: str) -> str:
     """
     Generates a prompt for simulating the consequence of a player's choice based on the current state of the game.
 
     Args:
-        memory_manager (MemoryManager): The memory manager containing the current state of the game.
+        context (PromptContext): The current state of the game.
         choice (str): The player's choice.
 
     Returns:
         str: The generated prompt.
     """
-    return f"""
-    Generate a consequence for the following action in the story game:
-    Action: {choice}
-    Character: {memory_manager.read("character")}
-    Setting: {memory_manager.read("setting")}
-    Plot: {memory_manager.read("plot")}
-    Motivation: {memory_manager.read("motivation")}
-    Story so far: {memory_manager.read('prose')}
-    Be creative and consider the past actions when generating the consequence, keep it causal and realistic.
-    Provide the consequence with 4 elements:
-    1. choice - A string description of the choice user made
-    2. consequence - A string describing what happens next less than 100 words
-    3. prose - A detailed description of the story so far including this new consequence structured as a short story. Be consistent with past actions and consequences and add more detail to the plot to make the story coherent. Keep all key information.
-    4. plot - A short summary describing the plot of the story based on the prose.
-    """
\ No newline at end of file
+    character, setting, motivation, plot, prose = context.as_strings()
+    # The full prose is kept here because the model rewrites the whole story from it.
+    p0, p1, p2, p3, p4, p5, p6 = _CONSEQUENCE_PARTS
+    return "".join((p0, character, p1, setting, p2, motivation, p3, plot, p4, prose, p5, choice, p6))
\ No newline at end of file